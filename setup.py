@@ -29,6 +29,7 @@ setup(
     author_email="tim@boring.green",
     package_dir={"": "src"},
     packages=find_packages(where="src"),
+    entry_points={"console_scripts": ["atlas-i2c=atlas_i2c.cli:main"]},
     python_requires=">=3.6",
     version=load_version(),
     long_description=long_description(),
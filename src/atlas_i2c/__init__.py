@@ -0,0 +1,48 @@
+"""Python package to communicate with Atlas Scientific EZO sensors in I2C mode.
+
+Submodules and the most commonly used classes are loaded lazily on first attribute access, so
+``import atlas_i2c`` stays cheap for short-lived scripts that only need part of the package.
+"""
+
+import importlib
+import sys
+
+from atlas_i2c.version import __version__
+
+_SUBMODULES = ("atlas_i2c", "commands", "constants", "sensors")
+
+_ATTRIBUTES = {
+    "AtlasI2C": "atlas_i2c",
+    "CommandResponse": "atlas_i2c",
+    "Sensor": "sensors",
+    "RtdSensor": "sensors",
+    "PhSensor": "sensors",
+    "OrpSensor": "sensors",
+    "DoSensor": "sensors",
+    "EcSensor": "sensors",
+}
+
+__all__ = ["__version__", *_SUBMODULES, *_ATTRIBUTES]
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+
+    if name in _ATTRIBUTES:
+        module = importlib.import_module(f"{__name__}.{_ATTRIBUTES[name]}")
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+# Module-level __getattr__ (PEP 562) is only honoured from Python 3.7 onwards.
+if sys.version_info < (3, 7):  # pragma: no cover
+    for _name in (*_SUBMODULES, *_ATTRIBUTES):
+        globals()[_name] = __getattr__(_name)
@@ -0,0 +1,340 @@
+"""Command-line tool to acquire data from Atlas Scientific EZO sensors.
+
+Sensors can be given individually on the command line or as a JSON config file:
+
+    {"sensors": [{"name": "temp", "address": 102, "bus": 1, "type": "rtd"}, ...]}
+
+The optional type is one of sensors.SENSOR_TYPES; typed sensors use their circuit's processing
+delays and add their parsed values to each reading.
+
+Readings are written to stdout as newline-delimited JSON. Sensors on the same bus are read as a
+batch: the command is written to every sensor, the longest processing delay is waited out once,
+and then each response is read back. Different buses are acquired concurrently.
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, IO, Iterable, List, Optional, Type
+
+from atlas_i2c import atlas_i2c
+from atlas_i2c import commands
+from atlas_i2c import constants
+from atlas_i2c import sensors
+
+
+# Factory default I2C addresses of the EZO circuits. scan only probes these (or the addresses it is
+# given), since writing the info command to an arbitrary chip could be taken as a register write.
+EZO_DEFAULT_ADDRESSES = (97, 98, 99, 100, 102, 103, 104, 105, 106, 108, 111, 112)
+
+
+class Error(Exception):
+    pass
+
+
+class ConfigError(Error):
+    pass
+
+
+def _config_int(entry: Dict[str, Any], key: str, default: Optional[int] = None) -> int:
+    """Return entry[key] as an int, accepting only integers and strings of decimal digits."""
+    value = entry.get(key, default)
+    if isinstance(value, str) and re.fullmatch(r"[0-9]+", value):
+        return int(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    raise ConfigError(f"sensor entry {entry!r} must have an integer {key!r}")
+
+
+def load_config(fd: IO[str]) -> List[Dict[str, Any]]:
+    """Load sensor definitions from a JSON config file."""
+    try:
+        config = json.load(fd)
+    except ValueError as ex:
+        raise ConfigError(f"invalid JSON config: {ex}")
+
+    if isinstance(config, dict):
+        config = config.get("sensors")
+    if not isinstance(config, list):
+        raise ConfigError("config must be a list of sensors or an object with a 'sensors' list")
+
+    entries = []
+    for entry in config:
+        if not isinstance(entry, dict) or "address" not in entry:
+            raise ConfigError(f"sensor entry {entry!r} must be an object with an 'address'")
+        sensor_type = entry.get("type")
+        if sensor_type is not None and (
+            not isinstance(sensor_type, str) or sensor_type not in sensors.SENSOR_TYPES
+        ):
+            raise ConfigError(
+                f"sensor type {sensor_type!r} not one of {tuple(sensors.SENSOR_TYPES)}"
+            )
+        address = _config_int(entry, "address")
+        bus = _config_int(entry, "bus", atlas_i2c.DEFAULT_BUS)
+        if address not in commands.I2C.addresses:
+            raise ConfigError(f"sensor address {address} not in range 1-127")
+        entries.append(
+            {
+                "name": str(entry.get("name", address)),
+                "address": address,
+                "bus": bus,
+                "type": sensor_type,
+            }
+        )
+    return entries
+
+
+def build_sensors(entries: Iterable[Dict[str, Any]]) -> List[sensors.Sensor]:
+    """Create Sensor objects, sharing a single AtlasI2C client per bus."""
+    clients: Dict[int, atlas_i2c.AtlasI2C] = {}
+    result: List[sensors.Sensor] = []
+    for entry in entries:
+        bus = entry["bus"]
+        if bus not in clients:
+            clients[bus] = atlas_i2c.AtlasI2C(bus=bus)
+        sensor_class: Type[sensors.Sensor] = sensors.Sensor
+        if entry.get("type"):
+            sensor_class = sensors.SENSOR_TYPES[entry["type"]]
+        sensor = sensor_class(entry["name"], entry["address"], i2c_client=clients[bus])
+        if isinstance(sensor, sensors.EzoSensor):
+            try:
+                sensor.sync_outputs()
+            except (OSError, sensors.Error):
+                # Retried by acquire_bus, which reports the error against the sensor
+                pass
+        result.append(sensor)
+    return result
+
+
+def _record(sensor: sensors.Sensor, **fields) -> Dict[str, Any]:
+    record = {"name": sensor.name, "bus": sensor.client.bus, "address": sensor.address}
+    record.update(fields)
+    return record
+
+
+def _response_record(
+    sensor: sensors.Sensor, response: atlas_i2c.CommandResponse, timestamp: float
+) -> Dict[str, Any]:
+    status_code = getattr(response, "status_code", None)
+    data = getattr(response, "data", b"")
+    record = _record(
+        sensor,
+        time=timestamp,
+        command=response.original_cmd,
+        status_code=status_code,
+        status=constants.status_code.get(status_code),
+        data=data.decode("latin-1"),
+    )
+    if isinstance(sensor, sensors.EzoSensor) and response.original_cmd == commands.READ.name:
+        try:
+            record["values"] = dict(sensor.parse(response)._asdict())
+        except sensors.ParseError as ex:
+            record["error"] = str(ex)
+    return record
+
+
+def acquire_bus(
+    bus_sensors: List[sensors.Sensor], cmd: Type[commands.Command] = commands.READ
+) -> List[Dict[str, Any]]:
+    """Send a command to every sensor on one bus, wait once and collect the responses.
+
+    Records are returned in the same order as bus_sensors.
+    """
+    records: List[Dict[str, Any]] = [{} for _ in bus_sensors]
+    pending = []
+    for index, sensor in enumerate(bus_sensors):
+        try:
+            if isinstance(sensor, sensors.EzoSensor) and cmd is commands.READ:
+                sensor.sync_outputs()
+            pending.append((index, sensor, sensor.send(cmd)))
+        except (OSError, sensors.Error) as ex:
+            records[index] = _record(sensor, time=time.time(), error=str(ex))
+
+    processing_delay = max(
+        (sensor.processing_delay(cmd) or 0 for _, sensor, _ in pending), default=0
+    )
+    if processing_delay:
+        time.sleep(processing_delay / 1000)
+
+    for index, sensor, command in pending:
+        try:
+            response = sensor.receive(command)
+        except OSError as ex:
+            records[index] = _record(sensor, time=time.time(), error=str(ex))
+        else:
+            records[index] = _response_record(sensor, response, time.time())
+    return records
+
+
+def acquire(
+    all_sensors: List[sensors.Sensor], cmd: Type[commands.Command] = commands.READ
+) -> List[Dict[str, Any]]:
+    """Acquire all sensors, running each bus in its own thread.
+
+    Records are returned in the same order as all_sensors.
+    """
+    by_bus: Dict[int, List[int]] = {}
+    for index, sensor in enumerate(all_sensors):
+        by_bus.setdefault(sensor.client.bus, []).append(index)
+
+    def acquire_group(indexes: List[int]) -> List[Dict[str, Any]]:
+        return acquire_bus([all_sensors[index] for index in indexes], cmd)
+
+    if len(by_bus) <= 1:
+        results: Iterable[List[Dict[str, Any]]] = [acquire_group(i) for i in by_bus.values()]
+    else:
+        with ThreadPoolExecutor(max_workers=len(by_bus)) as executor:
+            results = list(executor.map(acquire_group, by_bus.values()))
+
+    records: List[Dict[str, Any]] = [{} for _ in all_sensors]
+    for indexes, group_records in zip(by_bus.values(), results):
+        for index, record in zip(indexes, group_records):
+            records[index] = record
+    return records
+
+
+def scan(bus: int, addresses: Iterable[int] = EZO_DEFAULT_ADDRESSES) -> List[Dict[str, Any]]:
+    """Probe EZO addresses on a bus and report the devices that answer the info command."""
+    client = atlas_i2c.AtlasI2C(bus=bus)
+    try:
+        found = [sensors.Sensor(str(address), address, i2c_client=client) for address in addresses]
+        return [record for record in acquire_bus(found, commands.INFO) if "error" not in record]
+    finally:
+        client.close()
+
+
+def emit(records: Iterable[Dict[str, Any]], out: IO[str]) -> None:
+    for record in records:
+        out.write(json.dumps(record) + "\n")
+    out.flush()
+
+
+def _sensor_entries(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    entries = []
+    if args.config:
+        with open(args.config) as fd:
+            entries.extend(load_config(fd))
+    for address in args.address or []:
+        entries.append({"name": str(address), "address": address, "bus": args.bus, "type": None})
+    if not entries:
+        raise ConfigError("no sensors given; use --config and/or --address")
+    return entries
+
+
+def _close(all_sensors: List[sensors.Sensor]) -> None:
+    for client in {id(sensor.client): sensor.client for sensor in all_sensors}.values():
+        client.close()
+
+
+def cmd_scan(args: argparse.Namespace, out: IO[str]) -> None:
+    emit(scan(args.bus, args.address or EZO_DEFAULT_ADDRESSES), out)
+
+
+def cmd_read(args: argparse.Namespace, out: IO[str]) -> None:
+    all_sensors = build_sensors(_sensor_entries(args))
+    try:
+        emit(acquire(all_sensors), out)
+    finally:
+        _close(all_sensors)
+
+
+def cmd_stream(args: argparse.Namespace, out: IO[str]) -> None:
+    all_sensors = build_sensors(_sensor_entries(args))
+    try:
+        iteration = 0
+        while not args.count or iteration < args.count:
+            start = time.monotonic()
+            emit(acquire(all_sensors), out)
+            iteration += 1
+            if not args.count or iteration < args.count:
+                time.sleep(max(0.0, args.interval - (time.monotonic() - start)))
+    finally:
+        _close(all_sensors)
+
+
+def _non_negative(convert):
+    """Return an argparse type that converts with convert and rejects negative values."""
+
+    def parse(value: str):
+        try:
+            result = convert(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid value: {value!r}")
+        if not 0 <= result < float("inf"):
+            raise argparse.ArgumentTypeError(f"must be a non-negative number: {value!r}")
+        return result
+
+    return parse
+
+
+def _add_bus_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "-b", "--bus", type=int, default=atlas_i2c.DEFAULT_BUS, help="I2C bus number"
+    )
+
+
+def _add_sensor_arguments(parser: argparse.ArgumentParser) -> None:
+    _add_bus_argument(parser)
+    parser.add_argument("-c", "--config", help="JSON file listing sensors (name, address, bus)")
+    parser.add_argument(
+        "-a", "--address", type=int, action="append", help="sensor address; may be repeated"
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="atlas-i2c", description="Acquire data from Atlas Scientific EZO sensors over I2C."
+    )
+    subparsers = parser.add_subparsers(dest="subcommand")
+    subparsers.required = True
+
+    scan_parser = subparsers.add_parser("scan", help="list EZO devices on a bus")
+    _add_bus_argument(scan_parser)
+    scan_parser.add_argument(
+        "-a",
+        "--address",
+        type=int,
+        action="append",
+        help="address to probe instead of the EZO default addresses; may be repeated",
+    )
+    scan_parser.set_defaults(func=cmd_scan)
+
+    read_parser = subparsers.add_parser("read", help="take a single reading from each sensor")
+    _add_sensor_arguments(read_parser)
+    read_parser.set_defaults(func=cmd_read)
+
+    stream_parser = subparsers.add_parser("stream", help="take readings at a fixed interval")
+    _add_sensor_arguments(stream_parser)
+    stream_parser.add_argument(
+        "-i", "--interval", type=_non_negative(float), default=5.0, help="seconds between readings"
+    )
+    stream_parser.add_argument(
+        "-n",
+        "--count",
+        type=_non_negative(int),
+        default=0,
+        help="number of readings to take (0 = forever)",
+    )
+    stream_parser.set_defaults(func=cmd_stream)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None, out: Optional[IO[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        args.func(args, out or sys.stdout)
+    except (Error, OSError) as ex:
+        print(f"atlas-i2c: {ex}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -108,7 +108,7 @@ class CalibratePh(Command):
 class DataLogger(Command):
     """Enable/disable data logger."""
 
-    arguments: Tuple[Tuple, str] = (tuple(range(0, 32001)), "?")
+    arguments: Tuple[range, str] = (range(0, 32001), "?")
     name: str = "DataLogger"
     processing_delay: int = 300
 
@@ -164,7 +164,7 @@ class Info(Command):
 class I2C(Command):
     """Set I2C address and reboot device."""
 
-    addresses = tuple(range(1, 128))
+    addresses: range = range(1, 128)
     name: str = "I2C"
     processing_delay: int = 300
 
@@ -202,6 +202,40 @@ class Led(Command):
         return f"{cls.name},{arg}"
 
 
+class OutputDo(Command):
+    """Enable/disable dissolved oxygen output parameters."""
+
+    arguments: Tuple[str, str, str] = ("mg", "%", "?")
+    name: str = "O"
+    processing_delay: int = 300
+
+    @classmethod
+    def format_command(cls, arg: str = "?", enabled: bool = True) -> str:
+        if arg not in cls.arguments:
+            raise ArgumentError(f"{arg} must be one of {cls.arguments}")
+
+        if arg == "?":
+            return f"{cls.name},{arg}"
+        return f"{cls.name},{arg},{int(enabled)}"
+
+
+class OutputEc(Command):
+    """Enable/disable conductivity output parameters."""
+
+    arguments: Tuple[str, str, str, str, str] = ("EC", "TDS", "S", "SG", "?")
+    name: str = "O"
+    processing_delay: int = 300
+
+    @classmethod
+    def format_command(cls, arg: str = "?", enabled: bool = True) -> str:
+        if arg not in cls.arguments:
+            raise ArgumentError(f"{arg} must be one of {cls.arguments}")
+
+        if arg == "?":
+            return f"{cls.name},{arg}"
+        return f"{cls.name},{arg},{int(enabled)}"
+
+
 class PLock(Command):
     """Turn protocol lock on/off."""
 
@@ -1,7 +1,16 @@
-from typing import List, Optional, Union
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Type, Union
 
 from atlas_i2c import atlas_i2c
 from atlas_i2c import commands
+from atlas_i2c import constants
+
+
+class Error(Exception):
+    pass
+
+
+class ParseError(Error):
+    pass
 
 
 class Sensor:
@@ -20,16 +29,269 @@ class Sensor:
     def connect(self) -> None:
         self.client.set_i2c_address(self.address)
 
-    def query(self, cmd: commands.Command, arguments: Optional[List[str]] = None):
+    def processing_delay(self, cmd: Type[commands.Command]) -> Optional[int]:
+        """Return the number of milliseconds this sensor needs to process cmd."""
+        return cmd.processing_delay
+
+    def _format_command(
+        self, cmd: Type[commands.Command], arguments: Optional[List[str]] = None, **kwargs: Any
+    ):
         if arguments:
-            command: Optional[Union[int, str]] = cmd.format_command(arguments)  # type: ignore
+            command: Optional[Union[int, str]] = cmd.format_command(  # type: ignore
+                arguments, **kwargs
+            )
         else:
-            command = cmd.format_command()
+            command = cmd.format_command(**kwargs)  # type: ignore
+        return command
+
+    def query(
+        self, cmd: Type[commands.Command], arguments: Optional[List[str]] = None, **kwargs: Any
+    ):
+        """Send a command and read the response.
+
+        Keyword arguments are passed on to the command's format_command().
+        """
+        command = self._format_command(cmd, arguments, **kwargs)
 
         response: atlas_i2c.CommandResponse = self.client.query(
-            command, processing_delay=cmd.processing_delay
+            command, processing_delay=self.processing_delay(cmd)
         )
         # TODO: this doesn't feel like the right place to set the name of this attribute
         response.sensor_name = self.name
 
         return response
+
+    def send(
+        self, cmd: Type[commands.Command], arguments: Optional[List[str]] = None, **kwargs: Any
+    ) -> str:
+        """Write a command to the sensor without waiting for the response.
+
+        Together with receive(), this lets callers overlap the processing delays of several
+        sensors instead of sleeping for each one in turn.
+        """
+        command = self._format_command(cmd, arguments, **kwargs)
+        self.connect()
+        self.client.write(command)
+        return command
+
+    def receive(self, original_cmd: str) -> atlas_i2c.CommandResponse:
+        """Read the response to a command previously written with send()."""
+        self.connect()
+        response: atlas_i2c.CommandResponse = self.client.read(original_cmd)
+        response.sensor_name = self.name
+        return response
+
+
+COMMON_COMMANDS: Tuple[Type[commands.Command], ...] = (
+    commands.Baud,
+    commands.Calibrate,
+    commands.Export,
+    commands.Factory,
+    commands.Find,
+    commands.I2C,
+    commands.Import,
+    commands.Info,
+    commands.Led,
+    commands.PLock,
+    commands.Read,
+    commands.Sleep,
+    commands.Status,
+)
+
+
+class RtdReading(NamedTuple):
+    temperature: Optional[float] = None
+
+
+class PhReading(NamedTuple):
+    ph: Optional[float] = None
+
+
+class OrpReading(NamedTuple):
+    orp: Optional[float] = None
+
+
+class DoReading(NamedTuple):
+    dissolved_oxygen: Optional[float] = None
+    saturation: Optional[float] = None
+
+
+class EcReading(NamedTuple):
+    conductivity: Optional[float] = None
+    total_dissolved_solids: Optional[float] = None
+    salinity: Optional[float] = None
+    specific_gravity: Optional[float] = None
+
+
+class EzoSensor(Sensor):
+    """Base class for sensors of a known EZO circuit type.
+
+    Subclasses declare the commands the circuit supports, any processing delays that differ from
+    the command defaults, and how the values returned by the read command map onto a reading.
+    """
+
+    default_address: int
+    supported_commands: Tuple[Type[commands.Command], ...] = COMMON_COMMANDS
+    processing_delays: Dict[Type[commands.Command], int] = {}
+    reading_type: Any
+
+    # Output parameters in the order the circuit reports them, mapped to reading fields
+    output_command: Optional[Type[commands.Command]] = None
+    output_fields: Dict[str, str] = {}
+
+    def __init__(
+        self, name: str, address: Optional[int] = None, commands: List = None, i2c_client=None
+    ):
+        super().__init__(
+            name,
+            address if address is not None else self.default_address,
+            commands=commands,
+            i2c_client=i2c_client,
+        )
+        # Enabled output parameters; None until they have been queried from the circuit
+        self.outputs: Optional[Tuple[str, ...]] = None
+        if not self.output_command:
+            self.outputs = tuple(self.output_fields)
+
+    def processing_delay(self, cmd: Type[commands.Command]) -> Optional[int]:
+        return self.processing_delays.get(cmd, cmd.processing_delay)
+
+    def query(
+        self, cmd: Type[commands.Command], arguments: Optional[List[str]] = None, **kwargs: Any
+    ):
+        # Connect first, so the command reaches this sensor even when the client is shared
+        self.connect()
+        return super().query(cmd, arguments, **kwargs)
+
+    def _format_command(
+        self, cmd: Type[commands.Command], arguments: Optional[List[str]] = None, **kwargs: Any
+    ):
+        if cmd not in self.supported_commands:
+            raise commands.CommandDoesNotExistError(
+                f"{getattr(cmd, 'name', cmd)} is not supported by {type(self).__name__}"
+            )
+        return super()._format_command(cmd, arguments, **kwargs)
+
+    def parse(self, response: atlas_i2c.CommandResponse):
+        """Parse the response to a read command into a reading."""
+        status_code = getattr(response, "status_code", None)
+        if status_code != 1:
+            raise ParseError(
+                f"{self.name}: {constants.status_code.get(status_code, status_code)} response"
+            )
+
+        if self.outputs is None:
+            raise ParseError(f"{self.name}: output parameters unknown; call sync_outputs() first")
+
+        values = response.data.split(b",")
+        if len(values) != len(self.outputs):
+            raise ParseError(f"{self.name}: expected {len(self.outputs)} values, got {values}")
+
+        try:
+            return self.reading_type(
+                **{self.output_fields[o]: float(v) for o, v in zip(self.outputs, values)}
+            )
+        except ValueError as ex:
+            raise ParseError(f"{self.name}: {ex}")
+
+    def read(self):
+        """Take a reading and parse it."""
+        self.sync_outputs()
+        return self.parse(self.query(commands.READ))
+
+    def set_output(self, parameter: str, enabled: bool = True) -> atlas_i2c.CommandResponse:
+        """Enable or disable one of the values returned by the read command."""
+        if not self.output_command:
+            raise commands.CommandDoesNotExistError(
+                f"{type(self).__name__} does not support output configuration"
+            )
+        if parameter not in self.output_fields:
+            raise commands.ArgumentError(f"{parameter} must be one of {tuple(self.output_fields)}")
+
+        response = self.query(self.output_command, parameter, enabled=enabled)  # type: ignore
+        if getattr(response, "status_code", None) == 1 and self.outputs is not None:
+            outputs = set(self.outputs)
+            if enabled:
+                outputs.add(parameter)
+            else:
+                outputs.discard(parameter)
+            self.outputs = tuple(o for o in self.output_fields if o in outputs)
+        return response
+
+    def query_outputs(self) -> Tuple[str, ...]:
+        """Ask the circuit which output parameters are enabled and remember the answer."""
+        if not self.output_command:
+            return tuple(self.output_fields)
+
+        response = self.query(self.output_command, "?")  # type: ignore
+        if getattr(response, "status_code", None) != 1:
+            raise ParseError(f"{self.name}: could not query output parameters")
+
+        enabled = response.data.decode("latin-1").split(",")[1:]
+        outputs = tuple(o for o in self.output_fields if o in enabled)
+        self.outputs = outputs
+        return outputs
+
+    def sync_outputs(self) -> None:
+        """Query the circuit's output parameters unless they are already known."""
+        if self.outputs is None:
+            self.query_outputs()
+
+
+class RtdSensor(EzoSensor):
+    default_address: int = 102
+    supported_commands = COMMON_COMMANDS + (commands.DataLogger, commands.Scale)
+    processing_delays = {commands.Read: 600}
+    reading_type = RtdReading
+    output_fields = {"T": "temperature"}
+
+
+class PhSensor(EzoSensor):
+    default_address: int = 99
+    supported_commands = COMMON_COMMANDS + (commands.CalibratePh,)
+    processing_delays = {commands.Read: 900}
+    reading_type = PhReading
+    output_fields = {"pH": "ph"}
+
+
+class OrpSensor(EzoSensor):
+    default_address: int = 98
+    processing_delays = {commands.Read: 900}
+    reading_type = OrpReading
+    output_fields = {"ORP": "orp"}
+
+
+class DoSensor(EzoSensor):
+    default_address: int = 97
+    supported_commands = COMMON_COMMANDS + (
+        commands.CalibrateDo,
+        commands.OutputDo,
+        commands.Salinity,
+    )
+    processing_delays = {commands.Read: 600}
+    reading_type = DoReading
+    output_command = commands.OutputDo
+    output_fields = {"mg": "dissolved_oxygen", "%": "saturation"}
+
+
+class EcSensor(EzoSensor):
+    default_address: int = 100
+    supported_commands = COMMON_COMMANDS + (commands.OutputEc,)
+    processing_delays = {commands.Read: 600}
+    reading_type = EcReading
+    output_command = commands.OutputEc
+    output_fields = {
+        "EC": "conductivity",
+        "TDS": "total_dissolved_solids",
+        "S": "salinity",
+        "SG": "specific_gravity",
+    }
+
+
+SENSOR_TYPES: Dict[str, Type[EzoSensor]] = {
+    "rtd": RtdSensor,
+    "ph": PhSensor,
+    "orp": OrpSensor,
+    "do": DoSensor,
+    "ec": EcSensor,
+}
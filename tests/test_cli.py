@@ -0,0 +1,251 @@
+import io
+import json
+from unittest.mock import Mock, call, patch
+
+import pytest
+
+from atlas_i2c import atlas_i2c
+from atlas_i2c import cli
+from atlas_i2c import commands
+from atlas_i2c import sensors
+
+
+def make_client(bus, responses):
+    """Return an AtlasI2C client whose reads return responses[address] for the current address.
+
+    A response may also be a dict, mapping the command that was sent to the response for it.
+    """
+    client = atlas_i2c.AtlasI2C(bus=bus, device_file=io.BytesIO())
+    client.written = []
+    base_read = atlas_i2c.AtlasI2C.read
+
+    def set_i2c_address(address):
+        if address not in responses:
+            raise OSError(121, "Remote I/O error")
+        client.address = address
+
+    def read(original_cmd, num_of_bytes=31):
+        response = responses[client.address]
+        if isinstance(response, dict):
+            response = response[original_cmd]
+        client.device_file = io.BytesIO(response)
+        return base_read(client, original_cmd, num_of_bytes)
+
+    client.set_i2c_address = set_i2c_address
+    client.write = lambda cmd: client.written.append((client.address, cmd))
+    client.read = read
+    client.close = Mock()
+    return client
+
+
+class TestLoadConfig:
+    def test_object_with_sensors(self):
+        config = io.StringIO(
+            json.dumps({"sensors": [{"name": "temp", "address": 102, "bus": 3}, {"address": 99}]})
+        )
+        assert cli.load_config(config) == [
+            {"name": "temp", "address": 102, "bus": 3, "type": None},
+            {"name": "99", "address": 99, "bus": atlas_i2c.DEFAULT_BUS, "type": None},
+        ]
+
+    def test_list(self):
+        config = io.StringIO(json.dumps([{"name": "ph", "address": "99", "type": "ph"}]))
+        assert cli.load_config(config) == [{"name": "ph", "address": 99, "bus": 1, "type": "ph"}]
+
+    @pytest.mark.parametrize(
+        "config",
+        [
+            "not json",
+            "{}",
+            "[1]",
+            '[{"name": "temp"}]',
+            '[{"address": "abc"}]',
+            '[{"address": null}]',
+            '[{"address": 128}]',
+            '[{"address": 99.9}]',
+            '[{"address": true}]',
+            '[{"address": "-1"}]',
+            '[{"address": 1, "bus": 1.0}]',
+            '[{"address": 1, "bus": null}]',
+            '[{"address": 1, "bus": "one"}]',
+            '[{"address": 1, "type": "x"}]',
+            '[{"address": 1, "type": ["ph"]}]',
+        ],
+    )
+    def test_invalid(self, config):
+        with pytest.raises(cli.ConfigError):
+            cli.load_config(io.StringIO(config))
+
+
+class TestBuildSensors:
+    @patch("atlas_i2c.cli.time.sleep")
+    def test_typed_sensors_sync_outputs(self, sleep):
+        client = make_client(1, {97: {"O,?": b"\x01?O,%\x00"}, 102: b""})
+        entries = [
+            {"name": "do", "address": 97, "bus": 1, "type": "do"},
+            {"name": "gone", "address": 100, "bus": 1, "type": "ec"},
+            {"name": "temp", "address": 102, "bus": 1, "type": "rtd"},
+        ]
+        with patch("atlas_i2c.cli.atlas_i2c.AtlasI2C", return_value=client):
+            do, ec, temp = cli.build_sensors(entries)
+
+        assert isinstance(do, sensors.DoSensor)
+        assert do.outputs == ("%",)
+        assert ec.outputs is None
+        assert temp.outputs == ("T",)
+        assert client.written == [(97, "O,?")]
+
+
+class TestAcquire:
+    @patch("atlas_i2c.cli.time.sleep")
+    def test_acquire_bus_waits_once(self, sleep, good_response, error_response):
+        client = make_client(1, {99: good_response, 102: error_response})
+        bus_sensors = [
+            sensors.Sensor("ph", 99, i2c_client=client),
+            sensors.Sensor("temp", 102, i2c_client=client),
+        ]
+        records = cli.acquire_bus(bus_sensors)
+
+        sleep.assert_called_once_with(commands.READ.processing_delay / 1000)
+        assert client.written == [(99, "R"), (102, "R")]
+        assert [(r["name"], r["status"], r["data"]) for r in records] == [
+            ("ph", "SUCCESS", "1.642"),
+            ("temp", "SYNTAX ERROR", ""),
+        ]
+
+    @patch("atlas_i2c.cli.time.sleep")
+    def test_acquire_bus_reports_missing_sensor(self, sleep, good_response):
+        client = make_client(1, {99: good_response, 102: good_response})
+        bus_sensors = [
+            sensors.Sensor("ph", 99, i2c_client=client),
+            sensors.Sensor("gone", 42, i2c_client=client),
+            sensors.Sensor("temp", 102, i2c_client=client),
+        ]
+        records = cli.acquire_bus(bus_sensors)
+
+        assert records[0]["name"] == "ph"
+        assert records[0]["data"] == "1.642"
+        assert records[1]["name"] == "gone"
+        assert "error" in records[1]
+        assert records[2]["name"] == "temp"
+
+    @patch("atlas_i2c.cli.time.sleep")
+    def test_acquire_bus_with_typed_sensors(self, sleep):
+        ec_responses = {"O,?": b"\x01?O,EC,SG\x00", "R": b"\x011413,1.000\x00"}
+        client = make_client(1, {99: b"\x01*ER\x00", 100: ec_responses})
+        bus_sensors = [
+            sensors.PhSensor("ph", i2c_client=client),
+            sensors.EcSensor("ec", i2c_client=client),
+        ]
+        records = cli.acquire_bus(bus_sensors)
+
+        assert client.written == [(99, "R"), (100, "O,?"), (100, "R")]
+        assert sleep.call_args_list[-1] == call(0.9)
+        assert "error" in records[0]
+        assert records[1]["values"] == {
+            "conductivity": 1413.0,
+            "total_dissolved_solids": None,
+            "salinity": None,
+            "specific_gravity": 1.0,
+        }
+
+        client.written.clear()
+        records = cli.acquire_bus(bus_sensors)
+        assert client.written == [(99, "R"), (100, "R")]
+        assert records[1]["values"]["conductivity"] == 1413.0
+
+    @patch("atlas_i2c.cli.time.sleep")
+    def test_acquire_bus_when_outputs_cannot_be_queried(self, sleep, good_response):
+        client = make_client(1, {97: {"O,?": b"\xfe\x00"}, 99: good_response})
+        bus_sensors = [
+            sensors.DoSensor("do", i2c_client=client),
+            sensors.Sensor("ph", 99, i2c_client=client),
+        ]
+        records = cli.acquire_bus(bus_sensors)
+
+        assert client.written == [(97, "O,?"), (99, "R")]
+        assert records[0]["name"] == "do"
+        assert "error" in records[0]
+        assert records[1]["data"] == "1.642"
+
+    @patch("atlas_i2c.cli.time.sleep")
+    def test_acquire_multiple_buses(self, sleep, good_response):
+        clients = [
+            make_client(1, {99: good_response, 100: good_response}),
+            make_client(2, {102: good_response}),
+        ]
+        all_sensors = [
+            sensors.Sensor("ph", 99, i2c_client=clients[0]),
+            sensors.Sensor("temp", 102, i2c_client=clients[1]),
+            sensors.Sensor("ec", 100, i2c_client=clients[0]),
+        ]
+        records = cli.acquire(all_sensors)
+
+        assert [(r["bus"], r["address"]) for r in records] == [(1, 99), (2, 102), (1, 100)]
+        assert sleep.call_count == 2
+
+
+class TestMain:
+    @patch("atlas_i2c.cli.time.sleep")
+    def test_scan(self, sleep, good_response):
+        client = make_client(1, {97: good_response, 102: good_response})
+        out = io.StringIO()
+
+        with patch("atlas_i2c.cli.atlas_i2c.AtlasI2C", return_value=client):
+            assert cli.main(["scan", "--bus", "1"], out=out) == 0
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [r["address"] for r in records] == [97, 102]
+        assert records[0]["command"] == "i"
+        assert client.written == [(97, "i"), (102, "i")]
+
+    @patch("atlas_i2c.cli.time.sleep")
+    def test_scan_only_probes_ezo_addresses(self, sleep, good_response):
+        client = make_client(1, {address: good_response for address in range(1, 128)})
+        out = io.StringIO()
+
+        with patch("atlas_i2c.cli.atlas_i2c.AtlasI2C", return_value=client):
+            assert cli.main(["scan"], out=out) == 0
+        assert [address for address, _ in client.written] == list(cli.EZO_DEFAULT_ADDRESSES)
+
+    @patch("atlas_i2c.cli.time.sleep")
+    def test_scan_with_addresses(self, sleep, good_response):
+        client = make_client(1, {20: good_response, 102: good_response})
+        out = io.StringIO()
+
+        with patch("atlas_i2c.cli.atlas_i2c.AtlasI2C", return_value=client):
+            assert cli.main(["scan", "-a", "20", "-a", "21"], out=out) == 0
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [r["address"] for r in records] == [20]
+
+    @patch("atlas_i2c.cli.time.sleep")
+    @patch("atlas_i2c.cli.build_sensors")
+    def test_stream(self, build_sensors, sleep, good_response, tmp_path):
+        client = make_client(1, {99: good_response})
+        build_sensors.return_value = [sensors.Sensor("ph", 99, i2c_client=client)]
+        config = tmp_path / "sensors.json"
+        config.write_text(json.dumps([{"name": "ph", "address": 99}]))
+        out = io.StringIO()
+
+        assert cli.main(["stream", "-c", str(config), "-n", "3", "-i", "0"], out=out) == 0
+        assert len(out.getvalue().splitlines()) == 3
+        client.close.assert_called_once_with()
+
+    def test_read_with_invalid_config(self, capsys, tmp_path):
+        config = tmp_path / "sensors.json"
+        config.write_text(json.dumps([{"address": 99, "bus": None}]))
+
+        assert cli.main(["read", "-c", str(config)]) == 1
+        assert capsys.readouterr().err.startswith("atlas-i2c: ")
+
+    @pytest.mark.parametrize(
+        "option", [["-n", "-1"], ["-n", "two"], ["-i", "-0.5"], ["-i", "nan"], ["-i", "soon"]]
+    )
+    def test_stream_with_invalid_option(self, option, capsys):
+        with pytest.raises(SystemExit) as ex:
+            cli.main(["stream", "-a", "99"] + option)
+        assert ex.value.code == 2
+        assert f"argument {option[0]}" in capsys.readouterr().err
+
+    def test_read_without_sensors(self, capsys):
+        assert cli.main(["read"]) == 1
+        assert "no sensors given" in capsys.readouterr().err
@@ -86,6 +86,37 @@ class TestLedCommand:
             commands.Led.format_command(arg)
 
 
+class TestOutputDoCommand:
+    @pytest.mark.parametrize(
+        "arg, enabled, expected", [("mg", True, "O,mg,1"), ("%", False, "O,%,0")]
+    )
+    def test_format_command(self, arg, enabled, expected):
+        assert commands.OutputDo.format_command(arg, enabled) == expected
+
+    def test_format_command_with_question(self):
+        assert commands.OutputDo.format_command() == "O,?"
+
+    @pytest.mark.parametrize("arg", ["EC", "foo"])
+    def test_format_command_with_invalid_arg(self, arg):
+        with pytest.raises(commands.ArgumentError):
+            commands.OutputDo.format_command(arg)
+
+
+class TestOutputEcCommand:
+    @pytest.mark.parametrize("arg", ["EC", "TDS", "S", "SG"])
+    @pytest.mark.parametrize("enabled", [True, False])
+    def test_format_command(self, arg, enabled):
+        assert commands.OutputEc.format_command(arg, enabled) == f"O,{arg},{int(enabled)}"
+
+    def test_format_command_with_question(self):
+        assert commands.OutputEc.format_command("?") == "O,?"
+
+    @pytest.mark.parametrize("arg", ["mg", "ec", "foo"])
+    def test_format_command_with_invalid_arg(self, arg):
+        with pytest.raises(commands.ArgumentError):
+            commands.OutputEc.format_command(arg)
+
+
 class TestPLockCommand:
     @pytest.mark.parametrize("arg", [1, 0, "?"])
     def test_format_command(self, arg):
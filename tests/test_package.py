@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import atlas_i2c
+
+
+def run_python(code):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, stdout=subprocess.PIPE, check=True
+    )
+    return result.stdout.decode().strip()
+
+
+class TestPackage:
+    @pytest.mark.parametrize(
+        "access, expected",
+        [
+            ("pass", ["atlas_i2c.version"]),
+            ("atlas_i2c.AtlasI2C", ["atlas_i2c.atlas_i2c", "atlas_i2c.version"]),
+            ("atlas_i2c.commands", ["atlas_i2c.commands", "atlas_i2c.version"]),
+            (
+                "atlas_i2c.Sensor",
+                [
+                    "atlas_i2c.atlas_i2c",
+                    "atlas_i2c.commands",
+                    "atlas_i2c.constants",
+                    "atlas_i2c.sensors",
+                    "atlas_i2c.version",
+                ],
+            ),
+        ],
+    )
+    @pytest.mark.skipif(sys.version_info < (3, 7), reason="PEP 562 lazy loading needs 3.7+")
+    def test_import_is_lazy(self, access, expected):
+        loaded = run_python(
+            f"import sys, atlas_i2c; {access}; "
+            "print(','.join(sorted(m for m in sys.modules if m.startswith('atlas_i2c.'))))"
+        )
+        assert loaded.split(",") == expected
+
+    @pytest.mark.parametrize(
+        "name, module",
+        [("AtlasI2C", "atlas_i2c"), ("CommandResponse", "atlas_i2c"), ("Sensor", "sensors")],
+    )
+    def test_lazy_attribute(self, name, module):
+        submodule = getattr(atlas_i2c, module)
+        assert getattr(atlas_i2c, name) is getattr(submodule, name)
+
+    def test_lazy_submodule(self):
+        assert atlas_i2c.commands.READ.format_command() == "R"
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError):
+            atlas_i2c.does_not_exist
+
+    def test_dir(self):
+        assert set(atlas_i2c.__all__) <= set(dir(atlas_i2c))
+
+    def test_command_ranges_are_not_materialised(self):
+        # Building these as tuples at import time made importing commands noticeably slower
+        assert isinstance(atlas_i2c.commands.DataLogger.arguments[0], range)
+        assert isinstance(atlas_i2c.commands.I2C.addresses, range)
@@ -41,6 +41,14 @@ class TestSensor:
         assert isinstance(result, atlas_i2c.CommandResponse)
         assert result == response
 
+    def test_query_with_keyword_args(self):
+        device_file = io.BytesIO()
+        i2c_client = atlas_i2c.AtlasI2C(device_file=device_file)
+        i2c_client.query = Mock()
+        sensor = sensors.Sensor("test-sensor", i2c_client=i2c_client)
+        sensor.query(commands.OutputEc, "EC", enabled=False)
+        i2c_client.query.assert_called_once_with("O,EC,0", processing_delay=300)
+
     def test_query_with_nonexisting_command(self):
         device_file = io.BytesIO()
         i2c_client = atlas_i2c.AtlasI2C(device_file=device_file)
@@ -48,3 +56,158 @@ class TestSensor:
         with pytest.raises(AttributeError) as ex:
             sensor.query("eat")
 
+
+def make_response(data, status_code=1, original_cmd="R"):
+    response = atlas_i2c.CommandResponse()
+    response.sensor_address = 100
+    response.original_cmd = original_cmd
+    response.status_code = status_code
+    response.data = data
+    return response
+
+
+def make_sensor(sensor_class, *responses):
+    """Return a sensor whose client answers successive queries with responses."""
+    i2c_client = atlas_i2c.AtlasI2C(device_file=io.BytesIO())
+    i2c_client.query = Mock(side_effect=list(responses))
+    i2c_client.set_i2c_address = Mock()
+    return sensor_class("test-sensor", i2c_client=i2c_client)
+
+
+def outputs_response(data):
+    return make_response(data, original_cmd="O,?")
+
+
+class TestEzoSensor:
+    @pytest.mark.parametrize(
+        "sensor_class, address",
+        [
+            (sensors.RtdSensor, 102),
+            (sensors.PhSensor, 99),
+            (sensors.OrpSensor, 98),
+            (sensors.DoSensor, 97),
+            (sensors.EcSensor, 100),
+        ],
+    )
+    def test_default_address(self, sensor_class, address):
+        assert make_sensor(sensor_class).address == address
+
+    @pytest.mark.parametrize(
+        "sensor_class, data, expected",
+        [
+            (sensors.RtdSensor, b"21.345", sensors.RtdReading(21.345)),
+            (sensors.PhSensor, b"7.012", sensors.PhReading(7.012)),
+            (sensors.OrpSensor, b"-125.3", sensors.OrpReading(-125.3)),
+        ],
+    )
+    def test_read(self, sensor_class, data, expected):
+        sensor = make_sensor(sensor_class, make_response(data))
+        assert sensor.read() == expected
+        sensor.client.query.assert_called_once_with(
+            "R", processing_delay=sensor_class.processing_delays[commands.Read]
+        )
+
+    @pytest.mark.parametrize(
+        "sensor_class, outputs, data, expected",
+        [
+            (sensors.DoSensor, b"?O,mg", b"8.51", sensors.DoReading(8.51, None)),
+            (sensors.DoSensor, b"?O,%", b"95.2", sensors.DoReading(None, 95.2)),
+            (sensors.DoSensor, b"?O,mg,%", b"8.51,95.2", sensors.DoReading(8.51, 95.2)),
+            (
+                sensors.EcSensor,
+                b"?O,EC,TDS,S,SG",
+                b"1413,763,0.70,1.000",
+                sensors.EcReading(1413, 763, 0.7, 1.0),
+            ),
+            (
+                sensors.EcSensor,
+                b"?O,EC,SG",
+                b"1413,1.000",
+                sensors.EcReading(1413, None, None, 1.0),
+            ),
+        ],
+    )
+    def test_read_syncs_outputs(self, sensor_class, outputs, data, expected):
+        sensor = make_sensor(sensor_class, outputs_response(outputs), make_response(data))
+        assert sensor.read() == expected
+        assert [c[0][0] for c in sensor.client.query.call_args_list] == ["O,?", "R"]
+
+        sensor.client.query.side_effect = [make_response(data)]
+        assert sensor.read() == expected
+
+    @pytest.mark.parametrize(
+        "response",
+        [
+            make_response(b"", status_code=2),
+            make_response(b"1413,763"),
+            make_response(b"1413,763,*OV,1.000"),
+        ],
+    )
+    def test_read_with_bad_response(self, response):
+        sensor = make_sensor(sensors.EcSensor, outputs_response(b"?O,EC,TDS,S,SG"), response)
+        with pytest.raises(sensors.ParseError):
+            sensor.read()
+
+    def test_read_when_outputs_cannot_be_queried(self):
+        sensor = make_sensor(sensors.DoSensor, make_response(b"", status_code=254))
+        with pytest.raises(sensors.ParseError):
+            sensor.read()
+        assert sensor.outputs is None
+
+    def test_parse_without_outputs(self):
+        sensor = make_sensor(sensors.EcSensor)
+        with pytest.raises(sensors.ParseError):
+            sensor.parse(make_response(b"1413,763,0.70,1.000"))
+
+    def test_query_connects(self):
+        sensor = make_sensor(sensors.PhSensor, make_response(b"7.012"))
+        sensor.read()
+        sensor.client.set_i2c_address.assert_called_once_with(99)
+
+    def test_unsupported_command(self):
+        sensor = make_sensor(sensors.PhSensor)
+        with pytest.raises(commands.CommandDoesNotExistError):
+            sensor.query(commands.SCALE, "?")
+
+    def test_set_output(self):
+        sensor = make_sensor(
+            sensors.EcSensor,
+            outputs_response(b"?O,EC,TDS,S,SG"),
+            make_response(b"", original_cmd="O,TDS,0"),
+            make_response(b"", original_cmd="O,S,0"),
+            make_response(b"1413,1.000"),
+            make_response(b"", original_cmd="O,TDS,1"),
+        )
+        sensor.sync_outputs()
+        sensor.set_output("TDS", False)
+        sensor.set_output("S", False)
+        sensor.client.query.assert_called_with("O,S,0", processing_delay=300)
+        assert sensor.outputs == ("EC", "SG")
+
+        assert sensor.read() == sensors.EcReading(1413, None, None, 1.0)
+
+        sensor.set_output("TDS", True)
+        assert sensor.outputs == ("EC", "TDS", "SG")
+
+    def test_set_output_before_sync(self):
+        sensor = make_sensor(sensors.EcSensor, make_response(b"", original_cmd="O,TDS,0"))
+        sensor.set_output("TDS", False)
+        assert sensor.outputs is None
+
+    def test_set_output_with_invalid_parameter(self):
+        sensor = make_sensor(sensors.DoSensor)
+        with pytest.raises(commands.ArgumentError):
+            sensor.set_output("EC")
+
+    def test_set_output_without_output_command(self):
+        sensor = make_sensor(sensors.RtdSensor)
+        with pytest.raises(commands.CommandDoesNotExistError):
+            sensor.set_output("T")
+
+    def test_query_outputs(self):
+        sensor = make_sensor(
+            sensors.DoSensor, outputs_response(b"?O,%"), outputs_response(b"?O,mg,%")
+        )
+        assert sensor.query_outputs() == ("%",)
+        assert sensor.query_outputs() == ("mg", "%")
+        assert sensor.outputs == ("mg", "%")